@@ -10,6 +10,8 @@ class Settings:
     HUGGINGFACE_API_KEY: str = os.getenv("HUGGINGFACE_API_KEY", "")
     OLLAMA_URL: str = os.getenv("OLLAMA_URL", "http://localhost:11434")
     LLM_BACKEND: str = os.getenv("LLM_BACKEND", "gemini")
+    LLM_BATCH_SIZE: int = int(os.getenv("LLM_BATCH_SIZE", 8))
+    LLM_MAX_CONCURRENCY: int = int(os.getenv("LLM_MAX_CONCURRENCY", 8))
 
     DATABASE_URL: str = os.getenv("DATABASE_URL", "sqlite+aiosqlite:///./app.db")
     REDIS_URL: str = os.getenv("REDIS_URL", "redis://localhost:6379/0")
@@ -1,13 +1,21 @@
+import json
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
 from sqlalchemy.future import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models import ProjectTask
-from app.database import get_db
+from app.database import get_db, SessionLocal
 from fastapi import Depends
-from app.services.task_builder import generate_tasks_from_brief
+from app.services.task_builder import generate_tasks_from_brief, generate_tasks_from_briefs
+from app.services.llm_adapter import validate_backend
 
 router = APIRouter()
 
+class BatchBriefRequest(BaseModel):
+    briefs: list[str]
+
+
 @router.post("/generate")
 async def generate_project_tasks(brief: dict, db: AsyncSession = Depends(get_db)):
     """Generate structured project tasks from a brief."""
@@ -23,6 +31,34 @@ async def generate_project_tasks(brief: dict, db: AsyncSession = Depends(get_db)
 
     return {"created": len(tasks), "tasks": tasks}
 
+@router.post("/generate/batch")
+async def generate_project_tasks_batch(request: BatchBriefRequest):
+    """
+    Generate tasks for many briefs, batching their LLM calls.
+    Streams one NDJSON line per brief as soon as it completes (not in input order).
+    """
+    if not request.briefs:
+        raise HTTPException(status_code=400, detail="Missing project briefs.")
+
+    # Fail before streaming rather than persisting fallback tasks for every brief
+    try:
+        validate_backend()
+    except ValueError as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    async def stream_results():
+        # Own the session here: a Depends() session is closed before the body streams
+        async with SessionLocal() as db:
+            async for index, tasks in generate_tasks_from_briefs(request.briefs):
+                for t in tasks:
+                    task = ProjectTask(name=t["name"], description=t["description"], assigned_to=t["assigned_to"])
+                    db.add(task)
+                await db.commit()
+                line = {"index": index, "brief": request.briefs[index], "created": len(tasks), "tasks": tasks}
+                yield json.dumps(line) + "\n"
+
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
 @router.get("/")
 async def list_tasks(db: AsyncSession = Depends(get_db)):
     """List all project tasks."""
@@ -1,4 +1,5 @@
 import os
+import asyncio
 import httpx
 from tenacity import retry, stop_after_attempt, wait_fixed
 from app.config import settings
@@ -28,6 +29,70 @@ async def query_llm(prompt: str) -> str:
     return response
 
 
+def validate_backend() -> str:
+    """Return the configured backend, raising ValueError if it cannot be used."""
+    backend = settings.LLM_BACKEND.lower()
+    if backend not in ("gemini", "ollama", "hf"):
+        raise ValueError(f"Unsupported backend: {backend}")
+    if backend == "gemini" and not settings.GEMINI_API_KEY:
+        raise ValueError("Missing GEMINI_API_KEY")
+    if backend == "hf" and not settings.HUGGINGFACE_API_KEY:
+        raise ValueError("Missing HUGGINGFACE_API_KEY")
+    return backend
+
+
+async def query_llm_batch(prompts: list[str]):
+    """
+    Answer many prompts, yielding ``(index, response)`` pairs as they complete.
+
+    Gemini and Ollama prompts fan out concurrently, one request each; HuggingFace
+    prompts are grouped into chunks of ``LLM_BATCH_SIZE`` per backend call. A failed
+    prompt yields its exception as the response.
+    """
+    backend = validate_backend()
+
+    if backend == "gemini":
+        call_batch, size = _call_gemini_batch, 1
+    elif backend == "ollama":
+        call_batch, size = _call_ollama_batch, 1
+    else:
+        call_batch, size = _call_huggingface_batch, settings.LLM_BATCH_SIZE
+
+    # Serve cached prompts right away and send each distinct prompt only once
+    positions: dict[str, list[int]] = {}
+    for i, prompt in enumerate(prompts):
+        if prompt in _cache:
+            yield i, _cache[prompt]
+        else:
+            positions.setdefault(prompt, []).append(i)
+
+    pending = list(positions)
+    size = max(1, size)
+    limit = asyncio.Semaphore(max(1, settings.LLM_MAX_CONCURRENCY))
+
+    # The limit is held per HTTP request by the backend calls, not per chunk,
+    # and applies to this batch only; concurrent batches each get their own
+    async def run(chunk: list[str]):
+        try:
+            return chunk, await call_batch(chunk, limit)
+        except Exception as exc:
+            return chunk, [exc] * len(chunk)
+
+    jobs = [asyncio.ensure_future(run(pending[i:i + size])) for i in range(0, len(pending), size)]
+    try:
+        for next_done in asyncio.as_completed(jobs):
+            chunk, responses = await next_done
+            for prompt, response in zip(chunk, responses):
+                if not isinstance(response, Exception):
+                    _cache[prompt] = response
+                for i in positions[prompt]:
+                    yield i, response
+    finally:
+        # Stop outstanding calls if the consumer goes away (e.g. client disconnect)
+        for job in jobs:
+            job.cancel()
+
+
 async def _call_gemini(prompt: str) -> str:
     """Send a prompt to Google Gemini via REST API."""
     api_key = settings.GEMINI_API_KEY
@@ -74,3 +139,59 @@ async def _call_huggingface(prompt: str) -> str:
         r.raise_for_status()
         data = r.json()
         return data[0]["generated_text"] if isinstance(data, list) else str(data)
+
+
+@retry(stop=stop_after_attempt(3), wait=wait_fixed(2))
+async def _call_gemini_batch(prompts: list[str], limit: asyncio.Semaphore) -> list[str]:
+    """Gemini has no multi-prompt endpoint; each chunk holds a single prompt."""
+    async with limit:
+        return [await _call_gemini(prompt) for prompt in prompts]
+
+
+@retry(stop=stop_after_attempt(3), wait=wait_fixed(2))
+async def _call_ollama_batch(prompts: list[str], limit: asyncio.Semaphore) -> list[str]:
+    """Ollama has no multi-prompt endpoint; each chunk holds a single prompt."""
+    async with limit:
+        return [await _call_ollama(prompt) for prompt in prompts]
+
+
+async def _call_huggingface_batch(
+    prompts: list[str], limit: asyncio.Semaphore
+) -> list[str | Exception]:
+    """
+    Send a chunk of prompts to Hugging Face as one batched inference call.
+    If the chunk still fails after its retries, its prompts are retried one at a time.
+    """
+    try:
+        return await _call_huggingface_chunk(prompts, limit)
+    except Exception:
+        results = await asyncio.gather(
+            *(_call_huggingface_retrying(prompt, limit) for prompt in prompts), return_exceptions=True
+        )
+        return list(results)
+
+
+@retry(stop=stop_after_attempt(3), wait=wait_fixed(2))
+async def _call_huggingface_retrying(prompt: str, limit: asyncio.Semaphore) -> str:
+    async with limit:
+        return await _call_huggingface(prompt)
+
+
+@retry(stop=stop_after_attempt(3), wait=wait_fixed(2))
+async def _call_huggingface_chunk(prompts: list[str], limit: asyncio.Semaphore) -> list[str]:
+    api_key = settings.HUGGINGFACE_API_KEY
+    if not api_key:
+        raise ValueError("Missing HUGGINGFACE_API_KEY")
+
+    url = "https://api-inference.huggingface.co/models/google/flan-t5-base"
+    headers = {"Authorization": f"Bearer {api_key}"}
+    payload = {"inputs": prompts}
+
+    async with limit, httpx.AsyncClient(timeout=120) as client:
+        r = await client.post(url, headers=headers, json=payload)
+        r.raise_for_status()
+        data = r.json()
+        if not isinstance(data, list) or len(data) != len(prompts):
+            raise ValueError(f"Unexpected batch response from Hugging Face: {data}")
+        # Some pipelines wrap each output in its own list
+        return [(item[0] if isinstance(item, list) else item)["generated_text"] for item in data]
@@ -1,15 +1,20 @@
 # backend/app/services/task_builder.py
 import os
 import asyncio
+import logging
 import textwrap
+from contextlib import aclosing
 from datetime import datetime
 from pathlib import Path
 
 # Try to import your LLM adapter; fallback logic used if unavailable
 try:
-    from app.services.llm_adapter import query_llm
+    from app.services.llm_adapter import query_llm, query_llm_batch
 except Exception:
     query_llm = None
+    query_llm_batch = None
+
+logger = logging.getLogger(__name__)
 
 
 # -------------------------
@@ -42,12 +47,16 @@ def parse_llm_response(text: str):
     return tasks or _fallback_task_split(text)
 
 
+def _task_prompt(brief: str) -> str:
+    return f"Break this project idea into concrete technical tasks (short list):\n{brief}"
+
+
 def generate_tasks_from_brief(brief: str):
     """Synchronously run LLM (if available) and parse output; fallback otherwise."""
     if query_llm is None:
         return _fallback_task_split(brief)
 
-    prompt = f"Break this project idea into concrete technical tasks (short list):\n{brief}"
+    prompt = _task_prompt(brief)
     try:
         raw = asyncio.run(query_llm(prompt))
         if not isinstance(raw, str):
@@ -58,6 +67,35 @@ def generate_tasks_from_brief(brief: str):
         return _fallback_task_split(brief)
 
 
+async def generate_tasks_from_briefs(briefs: list[str]):
+    """
+    Yield ``(index, tasks)`` for each brief as soon as its LLM batch completes.
+    Briefs whose LLM call fails get the fallback split, like the single-brief path.
+    """
+    done = set()
+    if query_llm_batch is not None:
+        try:
+            async with aclosing(query_llm_batch([_task_prompt(b) for b in briefs])) as results:
+                async for i, raw in results:
+                    if isinstance(raw, Exception):
+                        logger.warning("LLM call failed for brief %d, using fallback tasks: %s", i, raw)
+                        tasks = _fallback_task_split(briefs[i])
+                    else:
+                        try:
+                            tasks = parse_llm_response(raw if isinstance(raw, str) else str(raw))
+                        except Exception:
+                            logger.exception("Could not parse LLM output for brief %d, using fallback tasks", i)
+                            tasks = _fallback_task_split(briefs[i])
+                    done.add(i)
+                    yield i, tasks
+        except Exception:
+            logger.exception("Batch task generation failed; using fallback tasks for remaining briefs")
+
+    for i, brief in enumerate(briefs):
+        if i not in done:
+            yield i, _fallback_task_split(brief)
+
+
 # -------------------------
 # Project file generation
 # -------------------------
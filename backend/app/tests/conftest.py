@@ -0,0 +1,10 @@
+import pytest
+from app.services import llm_adapter
+
+
+@pytest.fixture(autouse=True)
+def clear_llm_cache():
+    """Keep the adapter's in-memory prompt cache from leaking between tests."""
+    llm_adapter._cache.clear()
+    yield
+    llm_adapter._cache.clear()
@@ -1,5 +1,15 @@
+import json
+import asyncio
 from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.future import select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+from tenacity import wait_none
 from app.main import app
+from app.database import Base
+from app.models import ProjectTask
+from app.services.llm_adapter import _call_gemini_batch
 
 client = TestClient(app)
 
@@ -7,3 +17,89 @@ def test_root():
     response = client.get("/")
     assert response.status_code == 200
     assert "running" in response.json()["message"]
+
+
+def _batch_db(monkeypatch, tmp_path):
+    """Point the batch endpoint at a fresh SQLite file and return its session factory."""
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'batch.db'}", poolclass=NullPool)
+
+    async def create_tables():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    asyncio.run(create_tables())
+    session_factory = sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=False)
+    monkeypatch.setattr("app.routers.tasks.SessionLocal", session_factory)
+    return session_factory
+
+
+def _stored_tasks(session_factory):
+    async def fetch():
+        async with session_factory() as db:
+            result = await db.execute(select(ProjectTask))
+            return [t.name for t in result.scalars().all()]
+
+    return asyncio.run(fetch())
+
+
+def test_generate_tasks_batch_streams_ndjson(monkeypatch, tmp_path):
+    async def fake_gemini(prompt):
+        if "broken brief" in prompt:
+            raise RuntimeError("quota exceeded")
+        return "- " + prompt.splitlines()[-1] + " api"
+
+    session_factory = _batch_db(monkeypatch, tmp_path)
+    monkeypatch.setattr(_call_gemini_batch.retry, "wait", wait_none())
+    monkeypatch.setattr("app.services.llm_adapter.settings.LLM_BACKEND", "gemini")
+    monkeypatch.setattr("app.services.llm_adapter.settings.GEMINI_API_KEY", "test-key")
+    monkeypatch.setattr("app.services.llm_adapter._call_gemini", fake_gemini)
+
+    briefs = ["todo app", "broken brief", "chat app"]
+    response = client.post("/api/tasks/generate/batch", json={"briefs": briefs})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+
+    lines = {line["index"]: line for line in map(json.loads, response.text.splitlines())}
+    assert sorted(lines) == [0, 1, 2]
+    assert all(lines[i]["brief"] == briefs[i] for i in lines)
+    assert [t["name"] for t in lines[0]["tasks"]] == ["todo app api"]
+    assert [t["name"] for t in lines[2]["tasks"]] == ["chat app api"]
+    # Only the failing brief falls back to the default split
+    assert lines[1]["created"] == 3
+    assert lines[1]["tasks"][0]["name"] == "Setup Backend"
+
+    stored = _stored_tasks(session_factory)
+    assert sorted(stored) == sorted(t["name"] for line in lines.values() for t in line["tasks"])
+
+
+def test_generate_tasks_batch_rejects_empty_briefs():
+    response = client.post("/api/tasks/generate/batch", json={"briefs": []})
+    assert response.status_code == 400
+
+
+def test_generate_tasks_batch_rejects_bad_backend(monkeypatch, tmp_path):
+    session_factory = _batch_db(monkeypatch, tmp_path)
+    monkeypatch.setattr("app.services.llm_adapter.settings.LLM_BACKEND", "nope")
+
+    response = client.post("/api/tasks/generate/batch", json={"briefs": ["todo app"]})
+    assert response.status_code == 500
+    assert "Unsupported backend" in response.json()["detail"]
+    assert _stored_tasks(session_factory) == []
+
+
+def test_generate_tasks_batch_falls_back_on_unparseable_output(monkeypatch, tmp_path):
+    async def fake_gemini(prompt):
+        # A bare digit line trips up parse_llm_response
+        return "1" if "odd brief" in prompt else "- " + prompt.splitlines()[-1] + " api"
+
+    _batch_db(monkeypatch, tmp_path)
+    monkeypatch.setattr("app.services.llm_adapter.settings.LLM_BACKEND", "gemini")
+    monkeypatch.setattr("app.services.llm_adapter.settings.GEMINI_API_KEY", "test-key")
+    monkeypatch.setattr("app.services.llm_adapter._call_gemini", fake_gemini)
+
+    briefs = ["odd brief", "blog app", "shop app", "wiki app"]
+    response = client.post("/api/tasks/generate/batch", json={"briefs": briefs})
+    lines = {line["index"]: line for line in map(json.loads, response.text.splitlines())}
+    assert lines[0]["tasks"][0]["name"] == "Setup Backend"
+    for i in (1, 2, 3):
+        assert [t["name"] for t in lines[i]["tasks"]] == [f"{briefs[i]} api"]
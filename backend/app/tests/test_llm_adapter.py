@@ -1,6 +1,12 @@
 import pytest
 import asyncio
-from app.services.llm_adapter import query_llm
+from tenacity import wait_none
+from app.services.llm_adapter import (
+    query_llm,
+    query_llm_batch,
+    _call_ollama_batch,
+    _call_huggingface_retrying,
+)
 
 @pytest.mark.asyncio
 async def test_query_llm_fallback(monkeypatch):
@@ -10,3 +16,120 @@ async def test_query_llm_fallback(monkeypatch):
     monkeypatch.setattr("app.services.llm_adapter._call_gemini", fake_gemini)
     result = await query_llm("Hello test")
     assert "Simulated" in result
+
+
+@pytest.mark.asyncio
+async def test_query_llm_batch_chunks_prompts(monkeypatch):
+    calls = []
+
+    async def fake_hf_batch(prompts, limit):
+        calls.append(prompts)
+        return [f"out:{p}" for p in prompts]
+
+    monkeypatch.setattr("app.services.llm_adapter.settings.LLM_BACKEND", "hf")
+    monkeypatch.setattr("app.services.llm_adapter.settings.HUGGINGFACE_API_KEY", "test-key")
+    monkeypatch.setattr("app.services.llm_adapter.settings.LLM_BATCH_SIZE", 2)
+    monkeypatch.setattr("app.services.llm_adapter._call_huggingface_batch", fake_hf_batch)
+    prompts = ["batch a", "batch b", "batch c", "batch a"]
+    results = dict([pair async for pair in query_llm_batch(prompts)])
+    assert results == {0: "out:batch a", 1: "out:batch b", 2: "out:batch c", 3: "out:batch a"}
+    assert sorted(len(c) for c in calls) == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_query_llm_batch_cancels_pending_calls(monkeypatch):
+    finished = []
+
+    async def fake_gemini(prompt):
+        await asyncio.sleep(0.05 if prompt == "cancel 0" else 5)
+        finished.append(prompt)
+        return prompt
+
+    monkeypatch.setattr("app.services.llm_adapter.settings.LLM_BACKEND", "gemini")
+    monkeypatch.setattr("app.services.llm_adapter.settings.GEMINI_API_KEY", "test-key")
+    monkeypatch.setattr("app.services.llm_adapter._call_gemini", fake_gemini)
+    results = query_llm_batch([f"cancel {i}" for i in range(10)])
+    assert await results.__anext__() == (0, "cancel 0")
+    await results.aclose()
+    await asyncio.sleep(0.1)
+    assert finished == ["cancel 0"]
+    assert all(t.done() for t in asyncio.all_tasks() if t is not asyncio.current_task())
+
+
+@pytest.mark.asyncio
+async def test_query_llm_batch_ollama_retries_failed_prompt_alone(monkeypatch):
+    calls = []
+
+    async def fake_ollama(prompt):
+        calls.append(prompt)
+        if prompt == "ollama bad":
+            raise RuntimeError("model crashed")
+        return f"out:{prompt}"
+
+    monkeypatch.setattr(_call_ollama_batch.retry, "wait", wait_none())
+    monkeypatch.setattr("app.services.llm_adapter.settings.LLM_BACKEND", "ollama")
+    monkeypatch.setattr("app.services.llm_adapter._call_ollama", fake_ollama)
+    results = dict([pair async for pair in query_llm_batch(["ollama a", "ollama bad", "ollama b"])])
+    assert results[0] == "out:ollama a"
+    assert results[2] == "out:ollama b"
+    assert isinstance(results[1], Exception)
+    assert calls.count("ollama bad") == 3
+    assert calls.count("ollama a") == calls.count("ollama b") == 1
+
+
+@pytest.mark.asyncio
+async def test_query_llm_batch_limits_ollama_requests(monkeypatch):
+    in_flight = 0
+    peak = 0
+
+    async def fake_ollama(prompt):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        return prompt
+
+    monkeypatch.setattr("app.services.llm_adapter.settings.LLM_BACKEND", "ollama")
+    monkeypatch.setattr("app.services.llm_adapter.settings.LLM_BATCH_SIZE", 4)
+    monkeypatch.setattr("app.services.llm_adapter.settings.LLM_MAX_CONCURRENCY", 3)
+    monkeypatch.setattr("app.services.llm_adapter._call_ollama", fake_ollama)
+    results = [pair async for pair in query_llm_batch([f"limit {i}" for i in range(20)])]
+    assert len(results) == 20
+    assert peak == 3
+
+
+@pytest.mark.asyncio
+async def test_query_llm_batch_ollama_streams_each_prompt(monkeypatch):
+    async def fake_ollama(prompt):
+        await asyncio.sleep(5 if prompt == "stream slow" else 0)
+        return prompt
+
+    monkeypatch.setattr("app.services.llm_adapter.settings.LLM_BACKEND", "ollama")
+    monkeypatch.setattr("app.services.llm_adapter.settings.LLM_BATCH_SIZE", 8)
+    monkeypatch.setattr("app.services.llm_adapter._call_ollama", fake_ollama)
+    results = query_llm_batch(["stream slow", "stream a", "stream b"])
+    first = [await results.__anext__(), await results.__anext__()]
+    await results.aclose()
+    assert sorted(first) == [(1, "stream a"), (2, "stream b")]
+
+
+@pytest.mark.asyncio
+async def test_query_llm_batch_hf_retries_failed_chunk_per_prompt(monkeypatch):
+    async def broken_chunk(prompts, limit):
+        raise KeyError("generated_text")
+
+    async def fake_hf(prompt):
+        if prompt == "hf bad":
+            raise RuntimeError("model error")
+        return f"out:{prompt}"
+
+    monkeypatch.setattr(_call_huggingface_retrying.retry, "wait", wait_none())
+    monkeypatch.setattr("app.services.llm_adapter.settings.LLM_BACKEND", "hf")
+    monkeypatch.setattr("app.services.llm_adapter.settings.HUGGINGFACE_API_KEY", "test-key")
+    monkeypatch.setattr("app.services.llm_adapter._call_huggingface_chunk", broken_chunk)
+    monkeypatch.setattr("app.services.llm_adapter._call_huggingface", fake_hf)
+    results = dict([pair async for pair in query_llm_batch(["hf a", "hf bad", "hf b"])])
+    assert results[0] == "out:hf a"
+    assert results[2] == "out:hf b"
+    assert isinstance(results[1], Exception)